@@ -0,0 +1,16 @@
+# -*- encoding: utf-8 -*-
+"""pytest configuration.
+
+loadtest.py and the flaskapp package live at the top of the repo rather
+than in the installed package, so make sure they can be imported however
+the tests are run.
+
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -3,15 +3,14 @@
 """This script demonstrates the use of the tiling generators to draw some
 simple grids.
 
-When run from the command-line, it generates three images which
-demonstrate black-and-white tilings of the plain.
+When run from the command-line, it generates an image for every registered
+tiling, which demonstrate black-and-white tilings of the plane.
 
 """
 
 from PIL import Image, ImageDraw
 
-from specktre.tilings import (generate_hexagons, generate_squares,
-                              generate_triangles)
+from specktre.tilings import available_tilings, get_tiling
 
 CANVAS_WIDTH = 400
 CANVAS_HEIGHT = 400
@@ -27,6 +26,6 @@ def draw_tiling(coord_generator, filename):
 
 
 if __name__ == '__main__':
-    draw_tiling(generate_squares,   filename='tilings-squares.png')
-    draw_tiling(generate_triangles, filename='tilings-triangles.png')
-    draw_tiling(generate_hexagons,  filename='tilings-hexagons.png')
+    for name in available_tilings():
+        draw_tiling(get_tiling(name).generator,
+                    filename='tilings-%s.png' % name)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+import functools
+import io
+
+from flask import Response, abort, request
+
+from flaskapp import app
+from specktre.cli import Settings, check_color_input, check_positive_integer
+from specktre.specktre import draw_speckled_wallpaper
+from specktre.tilings import get_tiling
+
+# Largest width or height we'll render, so one request can't tie up a
+# worker indefinitely.
+MAX_DIMENSION = 4096
+
+
+@functools.lru_cache(maxsize=64)
+def render_png(width, height, tiling, start, end):
+    """Render a wallpaper as PNG bytes.
+
+    Identical requests are served from a cache, so the same URL always
+    returns the same image.
+
+    """
+    settings = Settings(
+        generator=get_tiling(tiling).generator,
+        width=width,
+        height=height,
+        start_color=check_color_input(start),
+        end_color=check_color_input(end),
+        name=None,
+    )
+    out = io.BytesIO()
+    draw_speckled_wallpaper(settings).save(out, format='PNG')
+    return out.getvalue()
+
+
+def _parse_render_args(args):
+    """Check the query parameters for /render.
+
+    Returns (width, height, tiling, start, end), raises ValueError if
+    any of them are invalid.
+
+    """
+    try:
+        width, height = args.get('size', '').split('x')
+    except ValueError:
+        raise ValueError('size should be in the form WxH')
+    width = check_positive_integer(name='Width', value=width)
+    height = check_positive_integer(name='Height', value=height)
+    if max(width, height) > MAX_DIMENSION:
+        raise ValueError('size should be at most %dx%d' %
+                         (MAX_DIMENSION, MAX_DIMENSION))
+
+    tiling = args.get('shape', 'squares')
+    get_tiling(tiling)
+
+    start = args.get('start', '')
+    end = args.get('end', '')
+    check_color_input(start)
+    check_color_input(end)
+
+    return width, height, tiling, start.lower(), end.lower()
+
+
+@app.route('/render')
+def render():
+    try:
+        params = _parse_render_args(request.args)
+    except ValueError as err:
+        abort(400, str(err))
+
+    return Response(render_png(*params), mimetype='image/png')
@@ -0,0 +1,363 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""Load-test the specktre rendering service.
+
+Replays a mix of requests to the /render view of flaskapp at a fixed
+concurrency, and reports latency percentiles, throughput, error rate and
+memory as JSON.  Exits with an error if every request fails.
+
+Usage:
+  loadtest.py (--url=<url> | --test-client) [options]
+  loadtest.py -h
+
+Options:
+  -h --help              Show this screen.
+  --url=<url>            Base URL of a running instance (e.g. http://localhost:5000).
+  --test-client          Drive the app in this process, with Flask's test client.
+  --path=<path>          Template for the render request path
+                         [default: /render?size={width}x{height}&shape={shape}&start={start}&end={end}].
+  --requests=<n>         Total number of requests to send [default: 200].
+  --concurrency=<n>      Number of concurrent clients [default: 8].
+  --sizes=<sizes>        Comma-separated sizes to choose from, as WxH
+                         [default: 400x400,1280x800,2560x1440].
+  --shapes=<shapes>      Comma-separated shapes to choose from
+                         [default: squares,triangles,hexagons].
+  --hit-ratio=<ratio>    Fraction of requests that repeat an earlier request,
+                         and so should be cache hits [default: 0.5].
+  --pid=<pid>            (Optional) PID of a server worker whose peak memory
+                         to report (Linux only).  Defaults to this process
+                         with --test-client.
+  --seed=<seed>          (Optional) Random seed, for a reproducible request mix.
+  --output=<file>        (Optional) Write the report here instead of stdout.
+
+"""  # noqa
+
+from __future__ import division, print_function
+
+import json
+import math
+import random
+import sys
+import threading
+import timeit
+
+import attr
+import docopt
+
+from specktre.cli import check_positive_integer
+
+try:
+    from urllib.error import HTTPError
+    from urllib.request import urlopen
+except ImportError:  # Python 2
+    from urllib2 import HTTPError, urlopen
+
+
+@attr.s
+class RenderRequest(object):
+    width = attr.ib()
+    height = attr.ib()
+    shape = attr.ib()
+    start = attr.ib()
+    end = attr.ib()
+
+    def path(self, template):
+        return template.format(**attr.asdict(self))
+
+
+@attr.s
+class Result(object):
+    latency = attr.ib()
+    error = attr.ib(default=None)
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def parse_sizes(value):
+    """Parse a comma-separated list of WxH sizes.
+
+    Returns a list of (width, height) tuples, raises ValueError otherwise.
+
+    """
+    sizes = []
+    for size in value.split(','):
+        try:
+            width, height = size.split('x')
+        except ValueError:
+            raise ValueError('Sizes should be in the form WxH; got %r' % size)
+        sizes.append((
+            check_positive_integer(name='Width', value=width),
+            check_positive_integer(name='Height', value=height),
+        ))
+    return sizes
+
+
+def plan_requests(count, sizes, shapes, hit_ratio):
+    """Build the list of requests to replay.
+
+    A `hit_ratio` fraction of requests repeat one that was planned earlier;
+    the rest use fresh colors, so a cache keyed on the request can't have
+    seen them before.
+
+    """
+    planned = []
+    seen = []
+    for _ in range(count):
+        if seen and random.random() < hit_ratio:
+            planned.append(random.choice(seen))
+            continue
+
+        width, height = random.choice(sizes)
+        request = RenderRequest(
+            width=width,
+            height=height,
+            shape=random.choice(shapes),
+            start='%06x' % random.getrandbits(24),
+            end='%06x' % random.getrandbits(24),
+        )
+        seen.append(request)
+        planned.append(request)
+    return planned
+
+
+def percentile(values, pct):
+    """Returns the `pct` percentile of a sorted list, by nearest rank."""
+    rank = max(int(math.ceil(pct / 100 * len(values))), 1)
+    return values[rank - 1]
+
+
+# A fetcher takes a request path, and returns None if the request succeeded
+# or a description of the error if it failed.
+
+def _url_fetcher(base_url):
+    def fetch(path):
+        try:
+            response = urlopen(base_url.rstrip('/') + path)
+        except HTTPError as err:
+            err.read()
+            return 'HTTP %d' % err.code
+        response.read()
+    return fetch
+
+
+def _test_client_fetcher():
+    # Imported here so the app isn't needed to load-test a remote instance.
+    from flaskapp import app
+    client = app.test_client()
+
+    def fetch(path):
+        response = client.get(path)
+        response.get_data()
+        if response.status_code >= 400:
+            return 'HTTP %d' % response.status_code
+    return fetch
+
+
+def _failing_fetcher(err):
+    def fetch(path):
+        raise err
+    return fetch
+
+
+def run(requests, new_fetcher, template, concurrency):
+    """Send `requests` from `concurrency` threads, and time each one.
+
+    Each thread gets its own fetcher from `new_fetcher()`; if that fails,
+    every request the thread sends fails with the same error.  Returns a
+    list of `Result` instances and the total wall-clock time.
+
+    """
+    pending = iter(requests)
+    lock = threading.Lock()
+    results = []
+
+    def worker():
+        try:
+            fetch = new_fetcher()
+        except Exception as err:
+            fetch = _failing_fetcher(err)
+
+        while True:
+            with lock:
+                request = next(pending, None)
+            if request is None:
+                return
+
+            path = request.path(template)
+            started = timeit.default_timer()
+            try:
+                error = fetch(path)
+            except Exception as err:
+                error = '%s: %s' % (type(err).__name__, err)
+            latency = timeit.default_timer() - started
+
+            with lock:
+                results.append(Result(latency=latency, error=error))
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = timeit.default_timer()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, timeit.default_timer() - started
+
+
+def peak_memory_kb(pid=None):
+    """Returns the peak resident memory of a process, in kilobytes.
+
+    Reads /proc for another process, so `pid` only works on Linux.
+    Raises ValueError if the peak memory can't be read.
+
+    """
+    if pid is None:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        # ru_maxrss is in bytes on macOS, and kilobytes everywhere else
+        if sys.platform == 'darwin':
+            peak //= 1024
+        return peak
+
+    try:
+        with open('/proc/%d/status' % pid) as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except (IOError, OSError) as err:
+        raise ValueError('Unable to read memory of PID %d: %s' % (pid, err))
+    raise ValueError('No VmHWM for PID %d' % pid)
+
+
+def summarise(results, duration):
+    """Summarise the results of a run.
+
+    With no results, the latency statistics and rates are None.
+
+    """
+    errors = [r.error for r in results if not r.ok]
+    report = {
+        'requests': len(results),
+        'errors': len(errors),
+        'error_rate': None,
+        'first_error': errors[0] if errors else None,
+        'duration_s': duration,
+        'throughput_rps': None,
+        'latency_ms': None,
+    }
+    if not results:
+        return report
+
+    latencies = sorted(r.latency * 1000 for r in results)
+    report.update({
+        'error_rate': len(errors) / len(results),
+        'throughput_rps': len(results) / duration if duration else None,
+        'latency_ms': {
+            'mean': sum(latencies) / len(latencies),
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'max': latencies[-1],
+        },
+    })
+    return report
+
+
+def parse_args(argv):
+    args = docopt.docopt(__doc__, argv)
+
+    try:
+        hit_ratio = float(args['--hit-ratio'])
+    except ValueError:
+        hit_ratio = -1
+    if not 0 <= hit_ratio <= 1:
+        sys.exit('--hit-ratio should be between 0 and 1; got %s' %
+                 args['--hit-ratio'])
+
+    try:
+        sizes = parse_sizes(args['--sizes'])
+    except ValueError as err:
+        sys.exit('--sizes: %s' % err)
+
+    try:
+        count = check_positive_integer(
+            name='--requests', value=args['--requests'])
+        concurrency = check_positive_integer(
+            name='--concurrency', value=args['--concurrency'])
+        pid = args['--pid'] and check_positive_integer(
+            name='--pid', value=args['--pid'])
+    except ValueError as err:
+        sys.exit(err)
+
+    return {
+        'url': args['--url'],
+        'path': args['--path'],
+        'requests': count,
+        'concurrency': concurrency,
+        'sizes': sizes,
+        'shapes': args['--shapes'].split(','),
+        'hit_ratio': hit_ratio,
+        'pid': pid,
+        'seed': args['--seed'],
+        'output': args['--output'],
+    }
+
+
+def main(argv=None):
+    config = parse_args(argv)
+
+    if config['seed'] is not None:
+        random.seed(config['seed'])
+    requests = plan_requests(
+        count=config['requests'],
+        sizes=config['sizes'],
+        shapes=config['shapes'],
+        hit_ratio=config['hit_ratio'],
+    )
+
+    if config['url']:
+        def new_fetcher():
+            return _url_fetcher(config['url'])
+    else:
+        new_fetcher = _test_client_fetcher
+
+    results, duration = run(
+        requests,
+        new_fetcher=new_fetcher,
+        template=config['path'],
+        concurrency=config['concurrency'],
+    )
+
+    report = summarise(results, duration)
+    report['config'] = config
+    report['warnings'] = []
+
+    report['peak_memory_kb'] = None
+    if config['url'] is not None and config['pid'] is None:
+        report['warnings'].append(
+            'Worker memory was not measured; pass --pid to include it.')
+    else:
+        try:
+            report['peak_memory_kb'] = peak_memory_kb(config['pid'])
+        except ValueError as err:
+            report['warnings'].append(str(err))
+
+    for warning in report['warnings']:
+        print('Warning: %s' % warning, file=sys.stderr)
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if config['output']:
+        with open(config['output'], 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if report['errors'] == report['requests']:
+        sys.exit('All %d requests failed; the first error was: %s' %
+                 (report['requests'], report['first_error']))
+
+
+if __name__ == '__main__':
+    main()
@@ -2,7 +2,7 @@
 """Generate checkerboard wallpaper images.
 
 Usage:
-  specktre.py new --size=<size> --start=<start> --end=<end> [--squares | --triangles | --hexagons] [--name=<name>]
+  specktre.py new --size=<size> --start=<start> --end=<end> [--tiling=<tiling> | --squares | --triangles | --hexagons] [--name=<name>] [--raw=<layout>]
   specktre.py -h
 
 Options:
@@ -10,10 +10,14 @@ Options:
   --size=<size>      Size in pixels - WxH (e.g. 100x200)
   --start=<start>    Start of the color range (hex, e.g. #01ab23)
   --end=<end>        End of the color range (hex, e.g. #01ab23)
-  --squares          Tile with squares.
-  --triangles        Tile with triangles.
-  --hexagons         Tile with hexagons.
+  --tiling=<tiling>  Tiling to use: squares, triangles, hexagons, rhombille,
+                     cairo, penrose, or one added by a plugin.
+  --squares          Tile with squares (same as --tiling=squares).
+  --triangles        Tile with triangles (same as --tiling=triangles).
+  --hexagons         Tile with hexagons (same as --tiling=hexagons).
   --name=<name>      (Optional) Name of the file to save to.
+  --raw=<layout>     (Optional) Save raw pixels instead of a PNG, in this
+                     layout: RGB, RGBA or BGRA.
 
 """  # noqa
 
@@ -24,7 +28,8 @@ import attr
 import docopt
 
 from .colors import RGBColor
-from .tilings import generate_hexagons, generate_squares, generate_triangles
+from .layouts import layout_modes
+from .tilings import get_tiling
 
 
 @attr.s
@@ -35,6 +40,7 @@ class Settings(object):
     start_color = attr.ib()
     end_color = attr.ib()
     name = attr.ib()
+    raw_layout = attr.ib(default=None)
 
 
 def check_positive_integer(name, value):
@@ -85,14 +91,15 @@ def check_color_input(value):
 def parse_args(argv):
     args = docopt.docopt(__doc__, argv)
 
-    if args['--squares']:
-        generator = generate_squares
-    elif args['--triangles']:
-        generator = generate_triangles
-    elif args['--hexagons']:
-        generator = generate_hexagons
-    else:
-        generator = generate_squares
+    tiling = args['--tiling'] or 'squares'
+    for shortcut in ('squares', 'triangles', 'hexagons'):
+        if args['--' + shortcut]:
+            tiling = shortcut
+
+    try:
+        generator = get_tiling(tiling).generator
+    except ValueError as err:
+        sys.exit('--tiling: %s' % err)
 
     try:
         width, height = args['--size'].split('x')
@@ -106,6 +113,14 @@ def parse_args(argv):
 
     name = args['--name']
 
+    raw_layout = args['--raw']
+    if raw_layout is not None:
+        raw_layout = raw_layout.upper()
+        try:
+            layout_modes(raw_layout)
+        except ValueError as err:
+            sys.exit('--raw: %s' % err)
+
     return Settings(
         generator=generator,
         width=width,
@@ -113,4 +128,5 @@ def parse_args(argv):
         start_color=start_color,
         end_color=end_color,
         name=name,
+        raw_layout=raw_layout,
     )
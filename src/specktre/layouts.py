@@ -0,0 +1,29 @@
+# -*- encoding: utf-8 -*-
+"""Pixel layouts for drawing wallpapers as raw pixels."""
+
+# Each layout maps to the Pillow image mode we draw in, and the raw mode
+# used to pack the pixels.
+LAYOUTS = {
+    'RGB': ('RGB', 'RGB'),
+    'RGBA': ('RGBA', 'RGBA'),
+    'BGRA': ('RGBA', 'BGRA'),
+}
+
+
+def layout_modes(layout):
+    """Returns the (mode, rawmode) pair for a pixel layout.
+
+    Raises ValueError if the layout isn't supported.
+
+    """
+    try:
+        return LAYOUTS[layout]
+    except KeyError:
+        raise ValueError(
+            'Layout should be one of %s; got %r' %
+            (', '.join(sorted(LAYOUTS)), layout))
+
+
+def bytes_per_pixel(layout):
+    """Returns the number of bytes used for each pixel in a layout."""
+    return len(layout_modes(layout)[1])
@@ -1,34 +1,191 @@
 # -*- encoding: utf-8 -*-
 
+from array import array
+import contextlib
+import mmap
 import sys
 
+import attr
 from PIL import Image, ImageDraw
 
 from . import cli
 from .colors import random_color
+from .layouts import bytes_per_pixel, layout_modes
 from .utils import new_filename
 
 
-def draw_speckled_wallpaper(settings):
-    im = Image.new(mode='RGB', size=(settings.width, settings.height))
-    squares = settings.generator(settings.width, settings.height)
+# Number of rows rendered at a time when drawing into a buffer.
+_STRIP_HEIGHT = 256
+
+
+def _speckled_tiles(settings):
+    """Generates (shape, fill) pairs for a wallpaper."""
+    shapes = settings.generator(settings.width, settings.height)
     colors = random_color(settings.start_color, settings.end_color)
-    for sq, color in zip(squares, colors):
-        ImageDraw.Draw(im).polygon(sq, fill=color)
+    for shape, color in zip(shapes, colors):
+        yield shape, attr.astuple(color)
+
+
+@contextlib.contextmanager
+def _writable_bytes(buffer, size):
+    """Context manager giving a flat, writable byte view of `buffer`.
+
+    The view is released on the way out, even if drawing fails, so the
+    caller can close or resize an mmap straight away.  Raises ValueError
+    if the buffer is read-only or the wrong size.
+
+    """
+    try:
+        base = memoryview(buffer)
+    except TypeError:
+        raise ValueError(
+            'Buffer should support the buffer protocol; got %r' % buffer)
+
+    with base:
+        try:
+            view = base.cast('B')
+        except TypeError:
+            raise ValueError(
+                'Buffer should be C-contiguous; got %r' % buffer)
+
+        with view:
+            if view.readonly:
+                raise ValueError(
+                    'Buffer should be writable; got %r' % buffer)
+            if view.nbytes != size:
+                raise ValueError(
+                    'Buffer should be %d bytes; got %d' % (size, view.nbytes))
+            yield view
+
+
+def _bucket_tiles(settings, strip_count):
+    """Sort the tiles of a wallpaper into horizontal strips.
+
+    Returns one (coords, sizes, fills) triple per strip, with the tiles
+    that overlap it in drawing order: the flattened vertex coordinates
+    (with y relative to the top of the strip), the number of vertices in
+    each tile, and the packed RGB fills.  These are kept in arrays rather
+    than as Python objects, which takes about 10x less memory.
+
+    """
+    strips = [
+        (array('d'), array('B'), bytearray()) for _ in range(strip_count)
+    ]
+    for shape, fill in _speckled_tiles(settings):
+        ys = [y for (_, y) in shape]
+        first = max(int(min(ys)) // _STRIP_HEIGHT, 0)
+        last = min(int(max(ys)) // _STRIP_HEIGHT, strip_count - 1)
+        for i in range(first, last + 1):
+            coords, sizes, fills = strips[i]
+            top = i * _STRIP_HEIGHT
+            for (x, y) in shape:
+                coords.append(x)
+                coords.append(y - top)
+            sizes.append(len(shape))
+            fills.extend(fill)
+    return strips
+
+
+def _draw_strip(im, coords, sizes, fills):
+    draw = ImageDraw.Draw(im)
+    offset = 0
+    for i, size in enumerate(sizes):
+        fill = tuple(fills[3 * i:3 * i + 3])
+        draw.polygon(coords[offset:offset + 2 * size].tolist(), fill=fill)
+        offset += 2 * size
+
+
+def _draw_into_buffer(settings, buffer, layout):
+    mode, rawmode = layout_modes(layout)
+    row_size = settings.width * len(rawmode)
+
+    # Pillow can't draw directly into memory it doesn't own, so we render
+    # one horizontal strip at a time and pack it into the buffer.  Tiles
+    # are bucketed by the strips they overlap, in drawing order, so
+    # overlapping edges come out the same as in a single image.
+    with _writable_bytes(buffer, size=row_size * settings.height) as view:
+        strip_count = (settings.height + _STRIP_HEIGHT - 1) // _STRIP_HEIGHT
+        strips = _bucket_tiles(settings, strip_count)
+
+        for i, (coords, sizes, fills) in enumerate(strips):
+            top = i * _STRIP_HEIGHT
+            height = min(_STRIP_HEIGHT, settings.height - top)
+            im = Image.new(mode=mode, size=(settings.width, height))
+            _draw_strip(im, coords, sizes, fills)
+
+            start = top * row_size
+            view[start:start + height * row_size] = im.tobytes('raw', rawmode)
+
+            # Drop each strip's tiles once they're drawn
+            strips[i] = None
+
+    return buffer
+
+
+def draw_speckled_wallpaper(settings, buffer=None, layout='RGB'):
+    """Draw a speckled wallpaper.
+
+    By default this returns a new `PIL.Image`.  If `buffer` is given, the
+    wallpaper is instead drawn into it and the buffer is returned.  It can
+    be any writable, C-contiguous object that supports the buffer protocol
+    (e.g. a bytearray, NumPy array or mmap), and should be exactly
+    width * height * bytes-per-pixel long.  `layout` is one of ``RGB``,
+    ``RGBA`` or ``BGRA``.  This needs Python 3.
+
+    Drawing into a buffer doesn't allocate a second copy of the frame,
+    only a strip of up to 256 rows at a time.  It does hold the
+    coordinates and fill of every tile while drawing -- roughly 50-100
+    bytes per tile -- so memory use still grows with the number of tiles.
+
+    """
+    if buffer is not None:
+        # Python 2's memoryview can't be cast to a flat view of bytes
+        if not hasattr(memoryview, 'cast'):
+            raise NotImplementedError(
+                'Drawing into a buffer requires Python 3')
+        return _draw_into_buffer(settings, buffer=buffer, layout=layout)
+
+    im = Image.new(mode='RGB', size=(settings.width, settings.height))
+    draw = ImageDraw.Draw(im)
+    for shape, fill in _speckled_tiles(settings):
+        draw.polygon(shape, fill=fill)
 
     return im
 
 
+def save_raw_wallpaper(settings, filename, layout='RGB'):
+    """Draw a speckled wallpaper as raw pixels into a memory-mapped file.
+
+    The file is created (or truncated) to the size of the image, so large
+    wallpapers are written straight to disk without being held in memory.
+
+    """
+    size = settings.width * settings.height * bytes_per_pixel(layout)
+    with open(filename, 'w+b') as f:
+        f.truncate(size)
+        out = mmap.mmap(f.fileno(), size)
+        try:
+            draw_speckled_wallpaper(settings, buffer=out, layout=layout)
+            out.flush()
+        finally:
+            out.close()
+
+
 def save_speckled_wallpaper(settings):
-    im = draw_speckled_wallpaper(settings)
     if settings.name:
         filename = settings.name
+    elif settings.raw_layout:
+        filename = new_filename(extension='raw')
     else:
         filename = new_filename()
-    im.save(filename)
+
+    if settings.raw_layout:
+        save_raw_wallpaper(settings, filename, layout=settings.raw_layout)
+    else:
+        draw_speckled_wallpaper(settings).save(filename)
     print('Saved new wallpaper as %s' % filename)
 
 
 def main():
-    settings = cli.parse_args(sys.argv)
+    settings = cli.parse_args(sys.argv[1:])
     save_speckled_wallpaper(settings)
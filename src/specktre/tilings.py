@@ -9,17 +9,97 @@ http://alexwlchan.net/2016/10/tiling-the-plane-with-pillow/
 
 from __future__ import division
 
+import cmath
 import math
+import warnings
+
+import attr
+
+# Height of an equilateral triangle with side length 1.  This is the
+# spacing between rows in the triangle and hexagon tilings.
+_ROW_HEIGHT = math.sin(math.pi / 3)
+
+
+def _scaled_size(image_width, image_height, side_length=50):
+    """Returns the size of an image in side lengths, rounded up."""
+    return (int(image_width / side_length) + 1,
+            int(image_height / side_length) + 1)
+
+
+def _check_side_length(side_length):
+    """Check a side length can be used for the built-in tilings.
+
+    Lattice vertices fall on half-sides, so the side length has to be a
+    whole number of pixels, and at least 2 so that half-sides don't
+    collapse onto each other.  Returns the side length as an int if so,
+    raises ValueError otherwise.
+
+    """
+    try:
+        is_integer = (int(side_length) == side_length)
+    except (TypeError, ValueError):
+        is_integer = False
+
+    if not is_integer:
+        raise ValueError(
+            'side_length should be an integer; got %r' % (side_length,))
+    if side_length < 2:
+        raise ValueError(
+            'side_length should be at least 2; got %r' % (side_length,))
+    return int(side_length)
 
 
 def _scale_coordinates(generator, image_width, image_height, side_length=50):
-    scaled_width = int(image_width / side_length) + 1
-    scaled_height = int(image_height / side_length) + 1
+    scaled_width, scaled_height = _scaled_size(
+        image_width, image_height, side_length)
 
     for coords in generator(scaled_width, scaled_height):
         yield [(x * side_length, y * side_length) for (x, y) in coords]
 
 
+def _scale_lattice(lattice, row_height,
+                   image_width, image_height, side_length=50):
+    """Map a lattice generator to integer pixel coordinates.
+
+    The lattice generator yields points (u, r), where u counts half-sides
+    along the x-axis and r counts rows of height `row_height` (in units of
+    the side length).  Every lattice point is mapped to the same pixel
+    wherever it appears, so neighbouring tiles share their edges exactly
+    and there are no hairline gaps or overlaps from float rounding.
+
+    Raises ValueError if `side_length` isn't a whole number of at least 2.
+
+    """
+    side_length = _check_side_length(side_length)
+    scaled_width, scaled_height = _scaled_size(
+        image_width, image_height, side_length)
+    return _lattice_pixels(
+        lattice(scaled_width, scaled_height), row_height, side_length)
+
+
+def _lattice_pixels(lattice_coords, row_height, side_length):
+    # Row offsets involve an irrational height, so compute each one once
+    # and reuse it for every vertex on that row.
+    row_offsets = {}
+
+    def _row_offset(r):
+        try:
+            return row_offsets[r]
+        except KeyError:
+            offset = int(math.floor(r * row_height * side_length))
+            row_offsets[r] = offset
+            return offset
+
+    for coords in lattice_coords:
+        yield [((u * side_length) // 2, _row_offset(r)) for (u, r) in coords]
+
+
+def _unit_lattice(lattice, row_height, image_width, image_height):
+    """Map a lattice generator to coordinates with unit side length."""
+    for coords in lattice(image_width, image_height):
+        yield [(u / 2, r * row_height) for (u, r) in coords]
+
+
 def generate_unit_squares(image_width, image_height):
     """Generate coordinates for a tiling of unit squares."""
     # Iterate over the required rows and cells.  The for loops (x, y)
@@ -41,8 +121,12 @@ def generate_squares(*args, **kwargs):
     return _scale_coordinates(generate_unit_squares, *args, **kwargs)
 
 
-def generate_unit_triangles(image_width, image_height):
-    """Generate coordinates for a tiling of unit triangles."""
+def _triangle_lattice(image_width, image_height):
+    """Generate lattice coordinates for a tiling of triangles.
+
+    Coordinates are (u, r), where u is in half-sides and r is the row.
+
+    """
     # Our triangles lie with one side parallel to the x-axis.  Let s be
     # the length of one side, and h the height of the triangle.
     #
@@ -55,34 +139,42 @@ def generate_unit_triangles(image_width, image_height):
     #    (x + 1/2, y + h) +-----+ (x + 3/2, y + h)
     #
     # where h = sin(60°) is the height of an equilateral triangle with
-    # side length 1.
+    # side length 1.  We count x in half-sides and y in rows, so every
+    # vertex lies on an integer lattice: (x, y) becomes (2x, y).
     #
     # On odd-numbered rows, we translate by (s/2, 0) to make the triangles
     # line up with the even-numbered rows.
     #
     # To avoid blank spaces on the edge of the canvas, the first pair of
     # triangles on each row starts at (-1, 0) -- one width before the edge
-    # of the canvas.
-    h = math.sin(math.pi / 3)
-
+    # of the canvas -- and we round the number of rows up.
     for x in range(-1, image_width):
-        for y in range(int(image_height / h)):
+        for y in range(int(math.ceil(image_height / _ROW_HEIGHT))):
 
             # Add a horizontal offset on odd numbered rows
-            x_ = x if (y % 2 == 0) else x + 0.5
+            u = 2 * x if (y % 2 == 0) else 2 * x + 1
 
-            yield [(x_, y * h), (x_ + 1, y * h), (x_ + 0.5, (y + 1) * h)]
-            yield [(x_ + 1, y * h), (x_ + 1.5, (y + 1) * h),
-                   (x_ + 0.5, (y + 1) * h)]
+            yield [(u, y), (u + 2, y), (u + 1, y + 1)]
+            yield [(u + 2, y), (u + 3, y + 1), (u + 1, y + 1)]
+
+
+def generate_unit_triangles(image_width, image_height):
+    """Generate coordinates for a tiling of unit triangles."""
+    return _unit_lattice(
+        _triangle_lattice, _ROW_HEIGHT, image_width, image_height)
 
 
 def generate_triangles(*args, **kwargs):
     """Generate coordinates for a tiling of triangles."""
-    return _scale_coordinates(generate_unit_triangles, *args, **kwargs)
+    return _scale_lattice(_triangle_lattice, _ROW_HEIGHT, *args, **kwargs)
 
 
-def generate_unit_hexagons(image_width, image_height):
-    """Generate coordinates for a regular tiling of unit hexagons."""
+def _hexagon_lattice(image_width, image_height):
+    """Generate lattice coordinates for a regular tiling of hexagons.
+
+    Coordinates are (u, r), where u is in half-sides and r is the row.
+
+    """
     # Let s be the length of one side of the hexagon, and h the height
     # of the entire hexagon if one side lies parallel to the x-axis.
     #
@@ -110,26 +202,315 @@ def generate_unit_hexagons(image_width, image_height):
     #             \___/   \___/   \___/
     #
     # There are offsets to ensure we fill the entire canvas.
-
-    # Half the height of the hexagon
-    h = math.sin(math.pi / 3)
-
+    #
+    # As with triangles, we count x in half-sides and y in rows of height
+    # h (half the height of the hexagon), so every vertex is an integer
+    # lattice point.
     for x in range(-1, image_width, 3):
-        for y in range(-1, int(image_height / h) + 1):
+        for y in range(-1, int(image_height / _ROW_HEIGHT) + 1):
 
             # Add the horizontal offset on every other row
-            x_ = x if (y % 2 == 0) else x + 1.5
+            u = 2 * x if (y % 2 == 0) else 2 * x + 3
 
             yield [
-                (x_,        y * h),
-                (x_ + 1,    y * h),
-                (x_ + 1.5, (y + 1) * h),
-                (x_ + 1,   (y + 2) * h),
-                (x_,       (y + 2) * h),
-                (x_ - 0.5, (y + 1) * h),
+                (u,     y),
+                (u + 2, y),
+                (u + 3, y + 1),
+                (u + 2, y + 2),
+                (u,     y + 2),
+                (u - 1, y + 1),
             ]
 
 
+def generate_unit_hexagons(image_width, image_height):
+    """Generate coordinates for a regular tiling of unit hexagons."""
+    return _unit_lattice(
+        _hexagon_lattice, _ROW_HEIGHT, image_width, image_height)
+
+
 def generate_hexagons(*args, **kwargs):
     """Generate coordinates for a tiling of hexagons."""
-    return _scale_coordinates(generate_unit_hexagons, *args, **kwargs)
+    return _scale_lattice(_hexagon_lattice, _ROW_HEIGHT, *args, **kwargs)
+
+
+def _rhombille_lattice(image_width, image_height):
+    """Generate lattice coordinates for a rhombille tiling.
+
+    Coordinates are (u, r), where u is in half-sides and r is the row.
+
+    """
+    # Every hexagon splits into three 60° rhombi which meet at its centre,
+    # which is also a lattice point:
+    #
+    #                     V0 +-----+ V1
+    #                       /     / \
+    #                      /     /   \
+    #                  V5 +     + C   + V2
+    #                      \     \   /
+    #                       \     \ /
+    #                     V4 +-----+ V3
+    #
+    for v0, v1, v2, v3, v4, v5 in _hexagon_lattice(image_width, image_height):
+        centre = (v0[0] + 1, v0[1] + 1)
+        yield [v0, v1, v2, centre]
+        yield [centre, v2, v3, v4]
+        yield [v5, v0, centre, v4]
+
+
+def generate_unit_rhombi(image_width, image_height):
+    """Generate coordinates for a rhombille tiling with unit sides."""
+    return _unit_lattice(
+        _rhombille_lattice, _ROW_HEIGHT, image_width, image_height)
+
+
+def generate_rhombi(*args, **kwargs):
+    """Generate coordinates for a rhombille tiling."""
+    return _scale_lattice(_rhombille_lattice, _ROW_HEIGHT, *args, **kwargs)
+
+
+def _cairo_cells(image_width, image_height):
+    """Returns the range of cells to cover a canvas with Cairo pentagons."""
+    # Cells are four half-sides across, and we add a cell on either side
+    # so that pentagons poking in from neighbouring cells are included.
+    return (range(-1, (image_width + 1) // 2 + 1),
+            range(-1, (image_height + 1) // 2 + 1))
+
+
+def _cairo_lattice(image_width, image_height):
+    """Generate lattice coordinates for a Cairo pentagonal tiling.
+
+    Coordinates are (u, r), both in half-sides.
+
+    """
+    # The 4-valent vertices of the tiling lie on a square grid, four units
+    # apart.  Each cell of that grid contains an edge between two 3-valent
+    # vertices -- horizontal or vertical, in a checkerboard pattern -- and
+    # each of those edges is shared by the two pentagons on either side.
+    #
+    # For a cell with a horizontal edge and corner (X, Y), those are:
+    #
+    #    (X, Y) +-----------+ (X + 4, Y)
+    #            \         /
+    #             +-------+  (X + 1, Y + 2) and (X + 3, Y + 2)
+    #            /         \
+    #           +-----------+
+    #
+    # plus the vertices (X + 2, Y - 1) and (X + 2, Y + 5), which come from
+    # the vertical edges in the cells above and below.
+    columns, rows = _cairo_cells(image_width, image_height)
+    for i in columns:
+        for j in rows:
+            x, y = 4 * i, 4 * j
+            if (i + j) % 2 == 0:
+                a, b = (x + 1, y + 2), (x + 3, y + 2)
+                yield [(x, y), a, b, (x + 4, y), (x + 2, y - 1)]
+                yield [(x, y + 4), a, b, (x + 4, y + 4), (x + 2, y + 5)]
+            else:
+                a, b = (x + 2, y + 1), (x + 2, y + 3)
+                yield [(x, y), a, b, (x, y + 4), (x - 1, y + 2)]
+                yield [(x + 4, y), a, b, (x + 4, y + 4), (x + 5, y + 2)]
+
+
+def generate_unit_cairo_pentagons(image_width, image_height):
+    """Generate coordinates for a Cairo tiling of unit pentagons."""
+    return _unit_lattice(_cairo_lattice, 1 / 2, image_width, image_height)
+
+
+def generate_cairo_pentagons(*args, **kwargs):
+    """Generate coordinates for a Cairo pentagonal tiling."""
+    return _scale_lattice(_cairo_lattice, 1 / 2, *args, **kwargs)
+
+
+_GOLDEN_RATIO = (1 + math.sqrt(5)) / 2
+
+
+def _robinson_triangles(radius, iterations, keep):
+    """Returns the Robinson triangles for a P3 Penrose tiling.
+
+    Each triangle is (thin, A, B, C), where A is the apex and the points
+    are complex numbers.  We start with a wheel of ten triangles that
+    covers a disc of the given radius, and subdivide it.  After every
+    round we drop the triangles where `keep(points)` is false; all their
+    descendants lie inside them, so none of those would be kept either.
+
+    See http://preshing.com/20110831/penrose-tiling-explained/
+
+    """
+    triangles = []
+    for i in range(10):
+        b = cmath.rect(radius, (2 * i - 1) * math.pi / 10)
+        c = cmath.rect(radius, (2 * i + 1) * math.pi / 10)
+        if i % 2 == 0:
+            b, c = c, b
+        triangles.append((True, 0j, b, c))
+    triangles = [t for t in triangles if keep(t[1:])]
+
+    for _ in range(iterations):
+        subdivided = []
+        for thin, a, b, c in triangles:
+            if thin:
+                p = a + (b - a) / _GOLDEN_RATIO
+                subdivided.extend([(True, c, p, b), (False, p, c, a)])
+            else:
+                q = b + (a - b) / _GOLDEN_RATIO
+                r = b + (c - b) / _GOLDEN_RATIO
+                subdivided.extend([
+                    (False, r, c, a), (False, q, r, b), (True, r, q, a),
+                ])
+        triangles = [t for t in subdivided if keep(t[1:])]
+    return triangles
+
+
+def generate_penrose_rhombi(image_width, image_height, side_length=50):
+    """Generate coordinates for a Penrose tiling of rhombi.
+
+    This tiling is aperiodic, so there are no unit coordinates: instead we
+    subdivide until the rhombi have sides of roughly `side_length`.  Only
+    rhombi near the canvas are generated.
+
+    Raises ValueError if `side_length` isn't a whole number of at least 2.
+
+    """
+    side_length = _check_side_length(side_length)
+    return _penrose_rhombi(image_width, image_height, side_length)
+
+
+def _penrose_rhombi(image_width, image_height, side_length):
+    half_width = image_width / 2
+    half_height = image_height / 2
+    centre = complex(half_width, half_height)
+
+    # The starting wheel is a decagon centred on the canvas.  Its inner
+    # radius reaches a few tiles past the corners, so that the triangles
+    # along its edge -- which have no mirror image -- are all culled.
+    radius = (abs(centre) + 4 * side_length) / math.cos(math.pi / 10)
+    iterations = max(
+        int(math.ceil(math.log(radius / side_length, _GOLDEN_RATIO))), 0)
+
+    def near_canvas(points):
+        # Does the bounding box of the points (relative to the centre of
+        # the canvas) overlap it, with a pixel to spare for rounding?
+        xs = [z.real for z in points]
+        ys = [z.imag for z in points]
+        return (min(xs) <= half_width + 1 and max(xs) >= -half_width - 1 and
+                min(ys) <= half_height + 1 and max(ys) >= -half_height - 1)
+
+    for _, a, b, c in _robinson_triangles(radius, iterations, near_canvas):
+        d = b + c - a
+
+        # Every rhombus is made of two mirror-image triangles, which have
+        # opposite orientations.  We draw it from the positively oriented
+        # half, unless that half was culled.
+        positive = ((b - a).conjugate() * (c - a)).imag > 0
+        if positive or not near_canvas((d, c, b)):
+            yield [
+                (int(round(z.real)), int(round(z.imag)))
+                for z in (a + centre, b + centre, d + centre, c + centre)
+            ]
+
+
+@attr.s(frozen=True)
+class Tiling(object):
+    """A tiling of the plane that specktre knows how to draw.
+
+    `generator` takes (image_width, image_height, side_length=50) and
+    yields the pixel coordinates of every tile.
+
+    """
+    name = attr.ib()
+    generator = attr.ib()
+
+
+# Third-party packages can add tilings by declaring a `Tiling` instance
+# as an entry point in this group.
+ENTRY_POINT_GROUP = 'specktre.tilings'
+
+_TILINGS = {}
+_loaded_entry_points = False
+
+
+def register_tiling(tiling):
+    """Make a tiling available by name, replacing any with the same name."""
+    _TILINGS[tiling.name] = tiling
+    return tiling
+
+
+def _entry_points():
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # Python < 3.8
+        import pkg_resources
+        return list(pkg_resources.iter_entry_points(ENTRY_POINT_GROUP))
+
+    eps = entry_points()
+    if hasattr(eps, 'select'):
+        return list(eps.select(group=ENTRY_POINT_GROUP))
+    return list(eps.get(ENTRY_POINT_GROUP, []))
+
+
+def _load_entry_points():
+    global _loaded_entry_points
+    if _loaded_entry_points:
+        return
+    _loaded_entry_points = True
+
+    for entry_point in _entry_points():
+        try:
+            tiling = entry_point.load()
+        except Exception as err:
+            warnings.warn(
+                'Unable to load tiling %r: %s' % (entry_point.name, err))
+            continue
+        register_tiling(tiling)
+
+
+def available_tilings():
+    """Returns the names of all the registered tilings."""
+    _load_entry_points()
+    return sorted(_TILINGS)
+
+
+def get_tiling(name):
+    """Look up a registered tiling by name.
+
+    Raises ValueError if there isn't a tiling with that name.
+
+    """
+    _load_entry_points()
+    try:
+        return _TILINGS[name]
+    except KeyError:
+        raise ValueError(
+            'Tiling should be one of %s; got %r' %
+            (', '.join(available_tilings()), name))
+
+
+register_tiling(Tiling(
+    name='squares',
+    generator=generate_squares,
+))
+
+register_tiling(Tiling(
+    name='triangles',
+    generator=generate_triangles,
+))
+
+register_tiling(Tiling(
+    name='hexagons',
+    generator=generate_hexagons,
+))
+
+register_tiling(Tiling(
+    name='rhombille',
+    generator=generate_rhombi,
+))
+
+register_tiling(Tiling(
+    name='cairo',
+    generator=generate_cairo_pentagons,
+))
+
+register_tiling(Tiling(
+    name='penrose',
+    generator=generate_penrose_rhombi,
+))
@@ -6,7 +6,7 @@ import random
 import string
 
 
-def _candidate_filenames():
+def _candidate_filenames(extension='png'):
     """Generates filenames of the form 'specktre_123AB.png'.
 
     The random noise is five characters long, which allows for
@@ -18,17 +18,17 @@ def _candidate_filenames():
             random.choice(string.ascii_letters + string.digits)
             for _ in range(5)
         ])
-        yield 'specktre_%s.png' % random_stub
+        yield 'specktre_%s.%s' % (random_stub, extension)
 
 
-def new_filename():
+def new_filename(extension='png'):
     """Returns a filename for a new specktre image.
 
-    This filename is of the form 'specktre_123AB.png' and does not
-    already exist when this function is called.
+    This filename is of the form 'specktre_123AB.png' (or with another
+    extension) and does not already exist when this function is called.
 
     """
-    for filename in _candidate_filenames():
+    for filename in _candidate_filenames(extension):
         if not os.path.exists(filename):
             return filename
 
@@ -10,6 +10,7 @@ from specktre import cli
 from specktre.colors import RGBColor
 from specktre.tilings import (
     generate_hexagons,
+    generate_penrose_rhombi,
     generate_squares,
     generate_triangles
 )
@@ -122,6 +123,41 @@ class TestArgParsing:
         ])
         assert settings.generator == generate_triangles
 
+    def test_selects_tiling_by_name(self):
+        settings = cli.parse_args([
+            "new", "--tiling", "penrose",
+            "--size", "10x10", "--start", "000000", "--end", "000000"
+        ])
+        assert settings.generator == generate_penrose_rhombi
+
+    def test_unknown_tiling_is_systemexit(self):
+        with pytest.raises(SystemExit, match="Tiling should be one of"):
+            cli.parse_args([
+                "new", "--tiling", "dodecagons",
+                "--size", "10x10", "--start", "000000", "--end", "000000"
+            ])
+
+    def test_png_output_by_default(self):
+        settings = cli.parse_args([
+            "new", "--size", "10x10", "--start", "000000", "--end", "000000"
+        ])
+        assert settings.raw_layout is None
+
+    @pytest.mark.parametrize("layout", ["bgra", "BGRA"])
+    def test_selects_raw_layout(self, layout):
+        settings = cli.parse_args([
+            "new", "--raw", layout,
+            "--size", "10x10", "--start", "000000", "--end", "000000"
+        ])
+        assert settings.raw_layout == "BGRA"
+
+    def test_unknown_raw_layout_is_systemexit(self):
+        with pytest.raises(SystemExit, match="Layout should be one of"):
+            cli.parse_args([
+                "new", "--raw", "CMYK",
+                "--size", "10x10", "--start", "000000", "--end", "000000"
+            ])
+
     @pytest.mark.parametrize("bad_size", ["10x", "x10", "x", "1y1"])
     def test_invalid_size_is_systemexit(self, bad_size):
         with pytest.raises(SystemExit, match="size should be in the form WxH"):
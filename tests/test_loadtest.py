@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""Unit tests for loadtest."""
+
+from __future__ import division
+
+import json
+import random
+
+import pytest
+
+import loadtest
+from loadtest import RenderRequest, Result
+
+
+class TestParseSizes(object):
+    """Unit tests for `loadtest.parse_sizes`."""
+
+    def test_parses_sizes(self):
+        assert loadtest.parse_sizes('10x20,300x400') == [(10, 20), (300, 400)]
+
+    @pytest.mark.parametrize(
+        'bad_sizes', ['10', '10x', 'x10', '10x0', '1x2,3'])
+    def test_invalid_sizes_are_valueerror(self, bad_sizes):
+        with pytest.raises(ValueError):
+            loadtest.parse_sizes(bad_sizes)
+
+
+class TestPlanRequests(object):
+    """Unit tests for `loadtest.plan_requests`."""
+
+    def plan(self, hit_ratio, count=1000):
+        random.seed(0)
+        return loadtest.plan_requests(
+            count=count,
+            sizes=[(10, 10), (20, 30)],
+            shapes=['squares', 'triangles'],
+            hit_ratio=hit_ratio,
+        )
+
+    def test_plans_requested_number(self):
+        assert len(self.plan(hit_ratio=0.5, count=17)) == 17
+
+    def test_no_repeats_with_zero_hit_ratio(self):
+        planned = self.plan(hit_ratio=0)
+        assert len(set(id(r) for r in planned)) == len(planned)
+
+    def test_all_repeats_with_full_hit_ratio(self):
+        planned = self.plan(hit_ratio=1)
+        assert all(r is planned[0] for r in planned)
+
+    def test_hit_ratio_holds(self):
+        planned = self.plan(hit_ratio=0.3)
+        repeats = len(planned) - len(set(id(r) for r in planned))
+        assert 0.25 <= repeats / len(planned) <= 0.35
+
+    def test_repeats_reuse_earlier_requests(self):
+        planned = self.plan(hit_ratio=0.5)
+        for i, request in enumerate(planned):
+            earlier = [r for r in planned[:i] if r == request]
+            assert all(r is request for r in earlier)
+
+    def test_requests_use_sizes_and_shapes(self):
+        for request in self.plan(hit_ratio=0.5):
+            assert (request.width, request.height) in [(10, 10), (20, 30)]
+            assert request.shape in ['squares', 'triangles']
+
+
+class TestPercentile(object):
+    """Unit tests for `loadtest.percentile`."""
+
+    @pytest.mark.parametrize('pct', [1, 50, 99, 100])
+    def test_single_element(self, pct):
+        assert loadtest.percentile([7], pct) == 7
+
+    @pytest.mark.parametrize('pct, expected', [
+        (1, 1), (10, 1), (11, 2), (50, 5), (95, 10), (99, 10), (100, 10),
+    ])
+    def test_nearest_rank(self, pct, expected):
+        assert loadtest.percentile(list(range(1, 11)), pct) == expected
+
+
+class TestSummarise(object):
+    """Unit tests for `loadtest.summarise`."""
+
+    def test_summarises_results(self):
+        results = [Result(latency=i / 1000) for i in range(1, 100)]
+        results.append(Result(latency=0.1, error='HTTP 500'))
+        report = loadtest.summarise(results, duration=2)
+        assert report['requests'] == 100
+        assert report['errors'] == 1
+        assert report['error_rate'] == 0.01
+        assert report['first_error'] == 'HTTP 500'
+        assert report['throughput_rps'] == 50
+        assert report['latency_ms']['p50'] == pytest.approx(50)
+        assert report['latency_ms']['p99'] == pytest.approx(99)
+        assert report['latency_ms']['max'] == pytest.approx(100)
+
+    def test_empty_results(self):
+        report = loadtest.summarise([], duration=0)
+        assert report['requests'] == 0
+        assert report['error_rate'] is None
+        assert report['latency_ms'] is None
+
+
+class TestRun(object):
+    """Unit tests for `loadtest.run`."""
+
+    def test_fetcher_errors_are_recorded(self):
+        def new_fetcher():
+            raise ImportError('no app here')
+
+        requests = [RenderRequest(1, 1, 'squares', '000000', '000000')] * 5
+        results, _ = loadtest.run(
+            requests, new_fetcher=new_fetcher, template='/', concurrency=2)
+        assert len(results) == 5
+        assert all('no app here' in r.error for r in results)
+
+
+class TestArgParsing(object):
+
+    def test_defaults(self):
+        config = loadtest.parse_args(['--url', 'http://localhost:5000'])
+        assert config['requests'] == 200
+        assert config['concurrency'] == 8
+        assert config['hit_ratio'] == 0.5
+        assert config['shapes'] == ['squares', 'triangles', 'hexagons']
+        assert config['pid'] is None
+
+    def test_parses_options(self):
+        config = loadtest.parse_args([
+            '--test-client', '--requests', '10', '--concurrency', '2',
+            '--sizes', '10x20', '--hit-ratio', '0.25', '--pid', '123',
+        ])
+        assert config['url'] is None
+        assert config['requests'] == 10
+        assert config['concurrency'] == 2
+        assert config['sizes'] == [(10, 20)]
+        assert config['hit_ratio'] == 0.25
+        assert config['pid'] == 123
+
+    @pytest.mark.parametrize('option, value, message', [
+        ('--requests', '0', 'should be positive'),
+        ('--concurrency', 'many', 'should be an integer'),
+        ('--pid', 'abc', 'should be an integer'),
+        ('--hit-ratio', '1.5', 'between 0 and 1'),
+        ('--hit-ratio', 'half', 'between 0 and 1'),
+        ('--sizes', '10', 'form WxH'),
+    ])
+    def test_invalid_options_are_systemexit(self, option, value, message):
+        with pytest.raises(SystemExit, match=message):
+            loadtest.parse_args(['--url', 'http://localhost', option, value])
+
+
+def test_test_client_run(tmpdir):
+    pytest.importorskip('flask')
+    path = str(tmpdir.join('report.json'))
+    loadtest.main([
+        '--test-client', '--requests', '6', '--concurrency', '2',
+        '--sizes', '40x30', '--seed', '1', '--output', path,
+    ])
+    with open(path) as f:
+        report = json.load(f)
+    assert report['requests'] == 6
+    assert report['errors'] == 0
+    assert report['peak_memory_kb'] > 0
+
+
+def test_all_requests_failing_is_systemexit(tmpdir):
+    pytest.importorskip('flask')
+    with pytest.raises(SystemExit, match='All 3 requests failed'):
+        loadtest.main([
+            '--test-client', '--requests', '3', '--path', '/missing',
+            '--output', str(tmpdir.join('report.json')),
+        ])
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+"""Unit tests for specktre.specktre."""
+
+import mmap
+import random
+import sys
+
+import pytest
+from PIL import Image
+
+from specktre.cli import Settings
+from specktre.colors import RGBColor
+from specktre.specktre import (
+    draw_speckled_wallpaper,
+    main,
+    save_raw_wallpaper,
+)
+from specktre.tilings import (
+    generate_hexagons,
+    generate_squares,
+    generate_triangles
+)
+
+requires_py3 = pytest.mark.skipif(
+    sys.version_info < (3,), reason='Drawing into a buffer needs Python 3')
+
+
+def make_settings(generator=generate_squares, width=300, height=600):
+    return Settings(
+        generator=generator,
+        width=width,
+        height=height,
+        start_color=RGBColor(10, 20, 30),
+        end_color=RGBColor(200, 150, 100),
+        name=None,
+    )
+
+
+def draw_image(settings, seed=0):
+    random.seed(seed)
+    return draw_speckled_wallpaper(settings)
+
+
+def draw_buffer(settings, layout, seed=0):
+    random.seed(seed)
+    buf = bytearray(settings.width * settings.height * len(layout))
+    assert draw_speckled_wallpaper(settings, buffer=buf, layout=layout) is buf
+    return bytes(buf)
+
+
+@requires_py3
+@pytest.mark.parametrize('generator', [
+    generate_squares, generate_triangles, generate_hexagons
+])
+def test_buffer_matches_image(generator):
+    """Drawing into an RGB buffer gives the same pixels as drawing an image,
+    even though the buffer is drawn in strips."""
+    settings = make_settings(generator=generator)
+    im = draw_image(settings)
+    assert draw_buffer(settings, layout='RGB') == im.tobytes()
+
+
+@requires_py3
+@pytest.mark.parametrize('layout', ['RGBA', 'BGRA'])
+def test_four_channel_layouts(layout):
+    settings = make_settings()
+    im = draw_image(settings).convert('RGBA')
+    assert draw_buffer(settings, layout=layout) == im.tobytes('raw', layout)
+
+
+@requires_py3
+def test_numpy_array_buffer():
+    numpy = pytest.importorskip('numpy')
+    settings = make_settings()
+    arr = numpy.zeros((settings.height, settings.width, 3), dtype=numpy.uint8)
+    random.seed(0)
+    draw_speckled_wallpaper(settings, buffer=arr)
+    assert arr.tobytes() == draw_image(settings).tobytes()
+
+
+@requires_py3
+def test_unknown_layout_is_valueerror():
+    with pytest.raises(ValueError, match='Layout should be one of'):
+        draw_speckled_wallpaper(
+            make_settings(), buffer=bytearray(10), layout='CMYK')
+
+
+@requires_py3
+def test_wrong_size_buffer_is_valueerror():
+    with pytest.raises(ValueError, match='Buffer should be 540000 bytes'):
+        draw_speckled_wallpaper(make_settings(), buffer=bytearray(10))
+
+
+@requires_py3
+def test_readonly_buffer_is_valueerror():
+    settings = make_settings()
+    buf = bytes(settings.width * settings.height * 3)
+    with pytest.raises(ValueError, match='Buffer should be writable'):
+        draw_speckled_wallpaper(settings, buffer=buf)
+
+
+@requires_py3
+def test_save_raw_wallpaper(tmpdir):
+    settings = make_settings(generator=generate_triangles)
+    path = str(tmpdir.join('wallpaper.raw'))
+
+    random.seed(0)
+    save_raw_wallpaper(settings, path, layout='BGRA')
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    im = draw_image(settings).convert('RGBA')
+    assert data == im.tobytes('raw', 'BGRA')
+
+
+def test_main_uses_command_line_arguments(monkeypatch, tmpdir):
+    """`main()` skips the program name in `sys.argv`."""
+    path = str(tmpdir.join('wallpaper.png'))
+    monkeypatch.setattr(sys, 'argv', [
+        'specktre', 'new', '--size=40x30', '--start=000000', '--end=ffffff',
+        '--name=%s' % path,
+    ])
+    main()
+    assert Image.open(path).size == (40, 30)
+
+
+@requires_py3
+def test_main_saves_raw_pixels(monkeypatch, tmpdir):
+    path = str(tmpdir.join('wallpaper.raw'))
+    monkeypatch.setattr(sys, 'argv', [
+        'specktre', 'new', '--size=40x30', '--start=000000', '--end=ffffff',
+        '--raw=RGBA', '--name=%s' % path,
+    ])
+    main()
+    assert tmpdir.join('wallpaper.raw').size() == 40 * 30 * 4
+
+
+def _failing_generator(image_width, image_height):
+    yield [(0, 0), (10, 0), (10, 10)]
+    raise RuntimeError('generator failed')
+
+
+@requires_py3
+@pytest.mark.parametrize('generator, size, error', [
+    (generate_squares, 50, ValueError),
+    (_failing_generator, 300 * 600 * 3, RuntimeError),
+])
+def test_mmap_can_be_closed_after_failed_draw(tmpdir, generator, size, error):
+    """A failed draw releases its view of the buffer straight away, so an
+    mmap can be closed while the exception is still being handled."""
+    settings = make_settings(generator=generator)
+    with open(str(tmpdir.join('wallpaper.raw')), 'w+b') as f:
+        f.truncate(size)
+        out = mmap.mmap(f.fileno(), size)
+        try:
+            draw_speckled_wallpaper(settings, buffer=out)
+        except error:
+            out.close()
+        assert out.closed
+
+
+@requires_py3
+def test_save_raw_wallpaper_raises_the_original_error(tmpdir):
+    settings = make_settings(generator=_failing_generator)
+    with pytest.raises(RuntimeError, match='generator failed'):
+        save_raw_wallpaper(settings, str(tmpdir.join('wallpaper.raw')))
+
+
+@pytest.mark.skipif(sys.version_info >= (3,), reason='Python 2 only')
+def test_buffer_on_python2_is_notimplementederror():
+    with pytest.raises(NotImplementedError, match='requires Python 3'):
+        draw_speckled_wallpaper(make_settings(), buffer=bytearray(10))
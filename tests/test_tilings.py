@@ -1,6 +1,29 @@
 # -*- encoding: utf-8 -*-
 
-from specktre.tilings import generate_squares
+import pytest
+from PIL import Image, ImageDraw
+
+from specktre import tilings
+from specktre.tilings import (
+    Tiling,
+    available_tilings,
+    generate_cairo_pentagons,
+    generate_hexagons,
+    generate_penrose_rhombi,
+    generate_rhombi,
+    generate_squares,
+    generate_triangles,
+    get_tiling,
+)
+
+ALL_GENERATORS = [
+    generate_squares,
+    generate_triangles,
+    generate_hexagons,
+    generate_rhombi,
+    generate_cairo_pentagons,
+    generate_penrose_rhombi,
+]
 
 
 def test_generate_squares():
@@ -21,3 +44,104 @@ def test_generate_squares():
         [(100, 50), (150, 50), (150, 100), (100, 100)],
         [(100, 100), (150, 100), (150, 150), (100, 150)]
     ]
+
+
+@pytest.mark.parametrize('generator', ALL_GENERATORS)
+@pytest.mark.parametrize('side_length', [7, 50, 51])
+def test_coordinates_are_integers(generator, side_length):
+    for shape in generator(300, 200, side_length=side_length):
+        for (x, y) in shape:
+            assert isinstance(x, int)
+            assert isinstance(y, int)
+
+
+@pytest.mark.parametrize('generator', ALL_GENERATORS)
+@pytest.mark.parametrize('side_length', [7, 50, 51])
+def test_tiling_leaves_no_gaps(generator, side_length):
+    """Filling every tile with a solid color leaves no unpainted pixels."""
+    im = Image.new('L', size=(300, 200))
+    draw = ImageDraw.Draw(im)
+    for shape in generator(300, 200, side_length=side_length):
+        draw.polygon(shape, fill=255)
+    assert im.getextrema() == (255, 255)
+
+
+def test_builtin_tilings_are_registered():
+    assert available_tilings() == [
+        'cairo', 'hexagons', 'penrose', 'rhombille', 'squares', 'triangles'
+    ]
+    assert get_tiling('squares').generator == generate_squares
+
+
+def test_unknown_tiling_is_valueerror():
+    with pytest.raises(ValueError, match='Tiling should be one of'):
+        get_tiling('dodecagons')
+
+
+class FakeEntryPoint(object):
+
+    def __init__(self, name, tiling):
+        self.name = name
+        self.tiling = tiling
+
+    def load(self):
+        if isinstance(self.tiling, Exception):
+            raise self.tiling
+        return self.tiling
+
+
+def test_tilings_are_loaded_from_entry_points(monkeypatch):
+    plugin = Tiling(name='plugin', generator=generate_squares)
+    monkeypatch.setattr(tilings, '_TILINGS', dict(tilings._TILINGS))
+    monkeypatch.setattr(tilings, '_loaded_entry_points', False)
+    monkeypatch.setattr(tilings, '_entry_points', lambda: [
+        FakeEntryPoint('plugin', plugin),
+        FakeEntryPoint('broken', ImportError('no module named broken')),
+    ])
+
+    with pytest.warns(UserWarning, match="Unable to load tiling 'broken'"):
+        assert 'plugin' in available_tilings()
+    assert get_tiling('plugin') is plugin
+    assert 'broken' not in available_tilings()
+
+
+@pytest.mark.parametrize('generator', [
+    generate_triangles,
+    generate_hexagons,
+    generate_rhombi,
+    generate_cairo_pentagons,
+    generate_penrose_rhombi,
+])
+@pytest.mark.parametrize('side_length, message', [
+    (50.9, 'should be an integer'),
+    ('50', 'should be an integer'),
+    (1, 'should be at least 2'),
+    (0, 'should be at least 2'),
+    (-4, 'should be at least 2'),
+])
+def test_tilings_reject_bad_side_lengths(
+        generator, side_length, message):
+    with pytest.raises(ValueError, match=message):
+        generator(100, 100, side_length=side_length)
+
+
+def test_whole_float_side_length_is_allowed():
+    assert (
+        list(generate_triangles(100, 100, side_length=50.0)) ==
+        list(generate_triangles(100, 100, side_length=50))
+    )
+
+
+@pytest.mark.parametrize('width, height', [(5120, 200), (300, 200), (10, 10)])
+def test_penrose_rhombi_are_near_canvas_and_unique(width, height):
+    """Penrose rhombi away from the canvas are skipped, and every rhombus
+    is only generated once."""
+    rhombi = list(generate_penrose_rhombi(width, height, side_length=50))
+    for rhombus in rhombi:
+        xs = [x for (x, _) in rhombus]
+        ys = [y for (_, y) in rhombus]
+        assert max(xs) >= -1 and min(xs) <= width + 1
+        assert max(ys) >= -1 and min(ys) <= height + 1
+
+    keys = [tuple(sorted(rhombus)) for rhombus in rhombi]
+    assert len(set(keys)) == len(keys)
@@ -25,3 +25,8 @@ def test_new_filename_always_gives_non_existent_file(tmpdir):
         open(f, 'w').write('')
 
     os.chdir(old_dir)
+
+
+def test_new_filename_uses_extension():
+    assert new_filename().endswith('.png')
+    assert new_filename(extension='raw').endswith('.raw')